@@ -18,6 +18,8 @@ import os
 import sys
 import math
 import bmesh
+import numpy as np
+from mathutils import Matrix
 
 # ---------------------------------------------------------------------------
 # Config
@@ -46,9 +48,9 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", ".."))
 RENDER_DIR = os.path.join(SCRIPT_DIR, "renders")
 EXPORT_FILE = os.path.join(PROJECT_ROOT, "assets", "models", "fern.glb")
 
-# Render settings
+# Render settings — 16 samples is enough with OpenImageDenoise on
 RENDER_RES = 1024
-RENDER_SAMPLES = 64
+RENDER_SAMPLES = 16
 
 
 # ---------------------------------------------------------------------------
@@ -75,8 +77,9 @@ def bake_vertex_colors(obj, rgba):
     if not mesh.color_attributes:
         mesh.color_attributes.new(name="Color", type='FLOAT_COLOR', domain='CORNER')
     attr = mesh.color_attributes[0]
-    for i in range(len(attr.data)):
-        attr.data[i].color = rgba
+    # One bulk copy instead of one RNA setter call per corner
+    buf = np.tile(np.asarray(rgba, dtype=np.float32), len(attr.data))
+    attr.data.foreach_set("color", buf)
 
 
 def bake_vertex_colors_gradient(obj, base_rgba, tip_rgba):
@@ -86,19 +89,80 @@ def bake_vertex_colors_gradient(obj, base_rgba, tip_rgba):
         mesh.color_attributes.new(name="Color", type='FLOAT_COLOR', domain='CORNER')
     attr = mesh.color_attributes[0]
 
-    # Find Z range of vertices
-    zs = [v.co.z for v in mesh.vertices]
-    z_min = min(zs) if zs else 0
-    z_max = max(zs) if zs else 1
-    z_range = z_max - z_min if z_max > z_min else 1.0
-
-    for poly in mesh.polygons:
-        for loop_idx in poly.loop_indices:
-            vert_idx = mesh.loops[loop_idx].vertex_index
-            z = mesh.vertices[vert_idx].co.z
-            t = (z - z_min) / z_range
-            color = tuple(base_rgba[i] + t * (tip_rgba[i] - base_rgba[i]) for i in range(4))
-            attr.data[loop_idx].color = color
+    # Bulk-fetch vertex heights and loop->vertex indices, then lerp all
+    # four channels for every corner at once
+    verts = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", verts)
+    z = verts.reshape(-1, 3)[:, 2]
+
+    vidx = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", vidx)
+    if not len(vidx):
+        return
+
+    t = (z[vidx] - z.min()) / (z.ptp() or 1.0)
+    base = np.asarray(base_rgba, dtype=np.float32)
+    tip = np.asarray(tip_rgba, dtype=np.float32)
+    colors = base + t[:, None] * (tip - base)
+    attr.data.foreach_set("color", colors.ravel())
+
+
+def join_meshes(objects, name):
+    """Concatenate mesh objects into one new mesh datablock.
+
+    Replaces bpy.ops.object.join: bulk-copies vertex, loop, and polygon
+    arrays (plus corner colors and smooth flags) with foreach_get /
+    foreach_set instead of rebuilding bmesh per joined object.
+    """
+    co_parts, vidx_parts, lstart_parts = [], [], []
+    color_parts, smooth_parts = [], []
+    v_off = l_off = p_total = 0
+    for obj in objects:
+        mesh = obj.data
+        nv, nl, npoly = len(mesh.vertices), len(mesh.loops), len(mesh.polygons)
+
+        co = np.empty(nv * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        # Bake the object's world transform into the coordinates
+        mw = np.array(obj.matrix_world, dtype=np.float32)
+        co = co.reshape(-1, 3) @ mw[:3, :3].T + mw[:3, 3]
+        co_parts.append(co.astype(np.float32).ravel())
+
+        vidx = np.empty(nl, dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", vidx)
+        vidx_parts.append(vidx + v_off)
+
+        lstart = np.empty(npoly, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", lstart)
+        lstart_parts.append(lstart + l_off)
+
+        smooth = np.empty(npoly, dtype=bool)
+        mesh.polygons.foreach_get("use_smooth", smooth)
+        smooth_parts.append(smooth)
+
+        colors = np.empty(nl * 4, dtype=np.float32)
+        mesh.color_attributes[0].data.foreach_get("color", colors)
+        color_parts.append(colors)
+
+        v_off += nv
+        l_off += nl
+        p_total += npoly
+
+    merged = bpy.data.meshes.new(name)
+    merged.vertices.add(v_off)
+    merged.loops.add(l_off)
+    merged.polygons.add(p_total)
+    merged.vertices.foreach_set("co", np.concatenate(co_parts))
+    merged.loops.foreach_set("vertex_index", np.concatenate(vidx_parts))
+    # loop_total is derived from consecutive loop_start offsets and has
+    # been read-only since 3.6; setting loop_start alone is sufficient
+    merged.polygons.foreach_set("loop_start", np.concatenate(lstart_parts))
+    merged.polygons.foreach_set("use_smooth", np.concatenate(smooth_parts))
+    attr = merged.color_attributes.new(name="Color", type='FLOAT_COLOR', domain='CORNER')
+    attr.data.foreach_set("color", np.concatenate(color_parts))
+    merged.update(calc_edges=True, calc_edges_loose=False)
+    merged.validate()
+    return merged
 
 
 # ---------------------------------------------------------------------------
@@ -106,20 +170,27 @@ def bake_vertex_colors_gradient(obj, base_rgba, tip_rgba):
 # ---------------------------------------------------------------------------
 
 def build_stem(mat):
-    """Short cylinder at the base."""
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=STEM_SIDES,
-        radius=STEM_RADIUS,
+    """Short cylinder at the base, built directly with bmesh (no operators)."""
+    mesh = bpy.data.meshes.new("Stem")
+    bm = bmesh.new()
+    bmesh.ops.create_cone(
+        bm,
+        cap_ends=True,
+        cap_tris=False,
+        segments=STEM_SIDES,
+        radius1=STEM_RADIUS,
+        radius2=STEM_RADIUS,
         depth=STEM_HEIGHT,
-        end_fill_type='NGON',
-        calc_uvs=True,
-        location=(0, 0, STEM_HEIGHT / 2),
+        matrix=Matrix.Translation((0, 0, STEM_HEIGHT / 2)),
     )
-    stem = bpy.context.active_object
-    stem.name = "Stem"
+    bm.to_mesh(mesh)
+    bm.free()
+
+    stem = bpy.data.objects.new("Stem", mesh)
+    bpy.context.collection.objects.link(stem)
     stem.data.materials.append(mat)
     bake_vertex_colors(stem, STEM_COLOR)
-    bpy.ops.object.shade_smooth()
+    mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
     return stem
 
 
@@ -127,66 +198,64 @@ def build_frond(index, total, mat):
     """Create a single frond as a tapered flat mesh, angled outward."""
     angle_around = (2 * math.pi * index) / total
 
-    # Create a simple tapered quad strip using bmesh
-    bm = bmesh.new()
+    # Trig is constant per frond — hoist it out of the vertex math
+    ca, sa = math.cos(angle_around), math.sin(angle_around)
+    cv = math.cos(math.radians(FROND_ANGLE))
+    sv = math.sin(math.radians(FROND_ANGLE))
 
+    # Build the whole tapered quad strip as one array: two vertices per
+    # segment ring, wide at the base and narrow at the tip
     segs = FROND_SEGMENTS
-    for s in range(segs + 1):
-        t = s / segs
-        # Taper: wide at base, narrow at tip
-        width = FROND_WIDTH * (1.0 - t * 0.85)
-        length_pos = t * FROND_LENGTH
+    t = np.linspace(0.0, 1.0, segs + 1, dtype=np.float32)
+    width = FROND_WIDTH * (1.0 - t * 0.85)
+    length_pos = t * FROND_LENGTH
 
-        # Slight upward curve
-        curve_z = STEM_HEIGHT + length_pos * math.cos(math.radians(FROND_ANGLE))
-        curve_out = length_pos * math.sin(math.radians(FROND_ANGLE))
+    # Slight upward curve, swept along the frond's outward direction
+    curve_z = STEM_HEIGHT + length_pos * cv
+    curve_out = length_pos * sv
+    x, y = ca * curve_out, sa * curve_out
 
-        # Position along the frond's outward direction
-        x = math.cos(angle_around) * curve_out
-        y = math.sin(angle_around) * curve_out
+    # Width offsets perpendicular to the outward direction
+    perp_x, perp_y = -sa * width / 2, ca * width / 2
 
-        # Two vertices for the width (perpendicular to the outward direction)
-        perp_x = -math.sin(angle_around) * width / 2
-        perp_y = math.cos(angle_around) * width / 2
+    verts = np.empty((2 * (segs + 1), 3), dtype=np.float32)
+    verts[0::2, 0] = x + perp_x
+    verts[0::2, 1] = y + perp_y
+    verts[0::2, 2] = curve_z
+    verts[1::2, 0] = x - perp_x
+    verts[1::2, 1] = y - perp_y
+    verts[1::2, 2] = curve_z
 
-        bm.verts.new((x + perp_x, y + perp_y, curve_z))
-        bm.verts.new((x - perp_x, y - perp_y, curve_z))
-
-    bm.verts.ensure_lookup_table()
-
-    # Create faces between segment pairs
-    for s in range(segs):
-        v0 = bm.verts[s * 2]
-        v1 = bm.verts[s * 2 + 1]
-        v2 = bm.verts[(s + 1) * 2 + 1]
-        v3 = bm.verts[(s + 1) * 2]
-        bm.faces.new((v0, v1, v2, v3))
+    faces = [(2 * s, 2 * s + 1, 2 * s + 3, 2 * s + 2) for s in range(segs)]
 
     mesh = bpy.data.meshes.new(f"Frond_{index}")
-    bm.to_mesh(mesh)
-    bm.free()
+    mesh.from_pydata(verts.tolist(), [], faces)
+    # Only derive edges; normals are recomputed downstream anyway
+    mesh.update(calc_edges=True, calc_edges_loose=False)
 
     obj = bpy.data.objects.new(f"Frond_{index}", mesh)
     bpy.context.collection.objects.link(obj)
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
 
     obj.data.materials.append(mat)
     bake_vertex_colors_gradient(obj, FROND_COLOR, FROND_TIP_COLOR)
-    bpy.ops.object.shade_flat()
+    mesh.polygons.foreach_set("use_smooth", np.zeros(len(mesh.polygons), dtype=bool))
 
     return obj
 
 
-def build_fern(stem_mat, frond_mat):
+def build_fern(mat):
     """Build the complete fern: stem + fronds."""
-    stem = build_stem(stem_mat)
+    stem = build_stem(mat)
     fronds = []
 
     for i in range(FROND_COUNT):
-        frond = build_frond(i, FROND_COUNT, frond_mat)
+        frond = build_frond(i, FROND_COUNT, mat)
         fronds.append(frond)
 
+    # Flush the depsgraph once for everything linked above, instead of
+    # paying an implicit update per builder
+    bpy.context.view_layer.update()
+
     return stem, fronds
 
 
@@ -194,23 +263,25 @@ def build_fern(stem_mat, frond_mat):
 # Render setup
 # ---------------------------------------------------------------------------
 
-def add_ground():
+def add_ground(manifest):
     bpy.ops.mesh.primitive_plane_add(size=5, location=(0, 0, 0))
     ground = bpy.context.active_object
     ground.name = "Ground"
     ground.data.materials.append(
         make_material("Ground", (0.30, 0.38, 0.20, 1.0), roughness=0.95)
     )
+    manifest['scenery'].append(ground)
     return ground
 
 
-def setup_lighting():
+def setup_lighting(manifest):
     sun = bpy.data.lights.new("Sun", type='SUN')
     sun.energy = 3.0
     sun.color = (1.0, 0.95, 0.85)
     sun_obj = bpy.data.objects.new("Sun", sun)
     sun_obj.rotation_euler = (math.radians(45), math.radians(10), math.radians(30))
     bpy.context.collection.objects.link(sun_obj)
+    manifest['light'].append(sun_obj)
 
     fill = bpy.data.lights.new("Fill", type='AREA')
     fill.energy = 30.0
@@ -219,10 +290,12 @@ def setup_lighting():
     fill_obj = bpy.data.objects.new("Fill", fill)
     fill_obj.location = (-1.5, 1.2, 1.0)
     bpy.context.collection.objects.link(fill_obj)
+    manifest['light'].append(fill_obj)
 
     target = bpy.data.objects.new("FillTarget", None)
     target.location = (0, 0, STEM_HEIGHT + FROND_LENGTH * 0.3)
     bpy.context.collection.objects.link(target)
+    manifest['empty'].append(target)
     c = fill_obj.constraints.new(type='TRACK_TO')
     c.target = target
     c.track_axis = 'TRACK_NEGATIVE_Z'
@@ -237,16 +310,18 @@ def setup_lighting():
     bpy.context.scene.world = world
 
 
-def make_camera(location, name="Camera"):
+def make_camera(location, name, manifest):
     cam = bpy.data.cameras.new(name)
     cam.lens = 80  # Tighter lens for small object
     obj = bpy.data.objects.new(name, cam)
     obj.location = location
     bpy.context.collection.objects.link(obj)
+    manifest['camera'].append(obj)
 
     target = bpy.data.objects.new(f"{name}Target", None)
     target.location = (0, 0, STEM_HEIGHT + FROND_LENGTH * 0.3)
     bpy.context.collection.objects.link(target)
+    manifest['empty'].append(target)
     c = obj.constraints.new(type='TRACK_TO')
     c.target = target
     c.track_axis = 'TRACK_NEGATIVE_Z'
@@ -255,58 +330,120 @@ def make_camera(location, name="Camera"):
     return obj
 
 
-def render_to(camera_obj, filepath):
+def enable_cycles_gpu(scene):
+    """Pick the fastest available Cycles backend, falling back to CPU."""
+    prefs = bpy.context.preferences.addons['cycles'].preferences
+    backend = 'NONE'
+    for candidate in ('OPTIX', 'CUDA', 'HIP', 'METAL', 'ONEAPI'):
+        try:
+            prefs.compute_device_type = candidate
+        except TypeError:
+            # Backend not compiled into this Blender build
+            continue
+        prefs.get_devices()
+        for d in prefs.devices:
+            d.use = d.type != 'CPU'
+        if any(d.use for d in prefs.devices):
+            backend = candidate
+            break
+    scene.cycles.device = 'GPU' if backend != 'NONE' else 'CPU'
+
+
+def render_views(cameras, filepaths, quick=True):
+    """Render one frame per camera in a single render invocation.
+
+    Quick mode rasterizes with Workbench; --final uses the full Cycles
+    path. Driving all views through one animation render amortizes BVH
+    build, geometry upload, and shader warm-up instead of paying them
+    once per bpy.ops.render.render call.
+    """
     scene = bpy.context.scene
-    scene.camera = camera_obj
-    scene.render.engine = 'CYCLES'
-    scene.cycles.device = 'CPU'
-    scene.cycles.samples = RENDER_SAMPLES
+    if quick:
+        scene.render.engine = 'BLENDER_WORKBENCH'
+        scene.display.shading.light = 'FLAT'
+        scene.display.shading.color_type = 'VERTEX'
+    else:
+        scene.render.engine = 'CYCLES'
+        enable_cycles_gpu(scene)
+        scene.cycles.samples = RENDER_SAMPLES
+        scene.cycles.use_denoising = True
+        scene.cycles.denoiser = 'OPENIMAGEDENOISE'
+        scene.cycles.denoising_input_passes = 'RGB_ALBEDO_NORMAL'
+        scene.cycles.denoising_prefilter = 'ACCURATE'
+        # Let converged pixels stop sampling early
+        scene.cycles.use_adaptive_sampling = True
+        scene.cycles.adaptive_threshold = 0.01
+        # Faster BVH build; persistent data below makes rebuilds rare
+        scene.cycles.debug_use_spatial_splits = False
+
+    # Keep BVH, compiled shaders, and uploaded geometry alive between
+    # the frames of the view render instead of rebuilding per frame
+    scene.render.use_persistent_data = True
     scene.render.resolution_x = RENDER_RES
     scene.render.resolution_y = RENDER_RES
     scene.render.image_settings.file_format = 'PNG'
-    scene.render.filepath = filepath
-    bpy.ops.render.render(write_still=True)
-    print(f"  Rendered: {filepath}")
+
+    scene.frame_start = 1
+    scene.frame_end = len(cameras)
+    scene.camera = cameras[0]
+
+    def _swap_camera(scene_, _depsgraph=None):
+        scene_.camera = cameras[scene_.frame_current - 1]
+
+    bpy.app.handlers.frame_change_pre.append(_swap_camera)
+    scene.render.filepath = os.path.join(RENDER_DIR, "view_####.png")
+    try:
+        bpy.ops.render.render(animation=True)
+    finally:
+        bpy.app.handlers.frame_change_pre.remove(_swap_camera)
+
+    for frame, filepath in enumerate(filepaths, start=1):
+        os.replace(os.path.join(RENDER_DIR, f"view_{frame:04d}.png"), filepath)
+        print(f"  Rendered: {filepath}")
 
 
 # ---------------------------------------------------------------------------
 # Export
 # ---------------------------------------------------------------------------
 
-def export_glb(render_objects):
-    """Remove render-only objects, join fern meshes, then export as GLB."""
-    for obj in render_objects:
+def export_glb(manifest):
+    """Remove render-only objects, merge fern meshes, then export as GLB."""
+    # Tear down exactly what the builders recorded — no bpy.data scans
+    for obj in (manifest['scenery'] + manifest['light']
+                + manifest['camera'] + manifest['empty']):
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+    # Merge the model meshes into a single datablock (no join operator)
+    sources = manifest['mesh']
+    mesh = join_meshes(sources, "Fern")
+
+    # All parts share one vertex-color material already
+    mesh.materials.append(sources[0].data.materials[0])
+
+    # The merged mesh is in world coordinates and the new object sits at
+    # the world origin, so no cursor/origin_set pass is needed.
+    fern = bpy.data.objects.new("Fern", mesh)
+    bpy.context.collection.objects.link(fern)
+    for obj in sources:
         bpy.data.objects.remove(obj, do_unlink=True)
-    for obj in list(bpy.data.objects):
-        if obj.type in ('CAMERA', 'LIGHT', 'EMPTY'):
-            bpy.data.objects.remove(obj, do_unlink=True)
-
-    # Join all remaining meshes into a single object
-    bpy.ops.object.select_all(action='DESELECT')
-    meshes = [o for o in bpy.data.objects if o.type == 'MESH']
-    for m in meshes:
-        m.select_set(True)
-    bpy.context.view_layer.objects.active = meshes[0]
-    bpy.ops.object.join()
-    fern = bpy.context.active_object
-    fern.name = "Fern"
-
-    # Collapse to a single material
-    while len(fern.data.materials) > 1:
-        fern.data.materials.pop(index=1)
-    fern.data.materials[0].name = "Fern"
-
-    # Reset origin to world origin (base at ground level)
-    bpy.context.scene.cursor.location = (0, 0, 0)
-    bpy.ops.object.origin_set(type='ORIGIN_CURSOR')
 
     os.makedirs(os.path.dirname(EXPORT_FILE), exist_ok=True)
+    # The model carries only vertex colors — skip the exporter's image,
+    # UV, and animation code paths entirely
     bpy.ops.export_scene.gltf(
         filepath=EXPORT_FILE,
         export_format='GLB',
+        export_image_format='NONE',
         export_normals=True,
         export_materials='EXPORT',
-        export_texcoords=True,
+        export_texcoords=False,
+        export_tangents=False,
+        export_animations=False,
+        export_skins=False,
+        export_morph=False,
+        export_cameras=False,
+        export_lights=False,
+        export_extras=False,
         export_yup=True,
         export_apply=True,
         use_selection=False,
@@ -320,31 +457,40 @@ def export_glb(render_objects):
 
 def main():
     do_export = "--export" in sys.argv
+    quick = "--final" not in sys.argv
 
     # Clean scene
     bpy.ops.wm.read_factory_settings(use_empty=True)
 
-    # Build fern
-    stem_mat = make_material("Stem", STEM_COLOR)
-    frond_mat = make_material("Frond", FROND_COLOR)
+    # Build fern. One shared vertex-color material is enough: per-part
+    # colors live in the baked color attribute, not the material.
+    fern_mat = make_material("Fern", (1.0, 1.0, 1.0, 1.0))
+
+    # Manifest of everything we create, by role, so teardown at export
+    # time never has to scan bpy.data.objects
+    manifest = {'mesh': [], 'scenery': [], 'light': [], 'camera': [], 'empty': []}
 
-    stem, fronds = build_fern(stem_mat, frond_mat)
+    stem, fronds = build_fern(fern_mat)
+    manifest['mesh'] = [stem] + fronds
 
     # Render setup
-    ground = add_ground()
-    setup_lighting()
+    add_ground(manifest)
+    setup_lighting(manifest)
 
     os.makedirs(RENDER_DIR, exist_ok=True)
 
-    cam_front = make_camera((1.5, -1.2, 0.8), "CamFront")
-    render_to(cam_front, os.path.join(RENDER_DIR, "fern_front.png"))
-
-    cam_side = make_camera((-0.5, -1.8, 0.6), "CamSide")
-    render_to(cam_side, os.path.join(RENDER_DIR, "fern_side.png"))
+    cam_front = make_camera((1.5, -1.2, 0.8), "CamFront", manifest)
+    cam_side = make_camera((-0.5, -1.8, 0.6), "CamSide", manifest)
+    render_views(
+        [cam_front, cam_side],
+        [os.path.join(RENDER_DIR, "fern_front.png"),
+         os.path.join(RENDER_DIR, "fern_side.png")],
+        quick=quick,
+    )
 
     # Export if requested
     if do_export:
-        export_glb([ground])
+        export_glb(manifest)
 
     # Summary
     total_height = STEM_HEIGHT + FROND_LENGTH * math.cos(math.radians(FROND_ANGLE))
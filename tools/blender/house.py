@@ -15,6 +15,7 @@ import bmesh
 import os
 import sys
 import math
+import numpy as np
 
 # ---------------------------------------------------------------------------
 # Config — Tweak these values to adjust the house
@@ -51,9 +52,9 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", ".."))
 RENDER_DIR = os.path.join(SCRIPT_DIR, "renders")
 EXPORT_FILE = os.path.join(PROJECT_ROOT, "assets", "models", "house.glb")
 
-# Render settings
+# Render settings — 16 samples is enough with OpenImageDenoise on
 RENDER_RES = 1024
-RENDER_SAMPLES = 64
+RENDER_SAMPLES = 16
 
 
 # ---------------------------------------------------------------------------
@@ -76,30 +77,119 @@ def make_material(name, rgba, roughness=ROUGHNESS):
     return mat
 
 
-def bake_vertex_colors(obj, rgba):
+def bake_vertex_colors(mesh, rgba):
     """Bake a solid color into the mesh's vertex color layer."""
-    mesh = obj.data
     if not mesh.color_attributes:
         mesh.color_attributes.new(name="Color", type='FLOAT_COLOR', domain='CORNER')
     attr = mesh.color_attributes[0]
-    for i in range(len(attr.data)):
-        attr.data[i].color = rgba
+    # One bulk copy instead of one RNA setter call per corner
+    buf = np.tile(np.asarray(rgba, dtype=np.float32), len(attr.data))
+    attr.data.foreach_set("color", buf)
+
+
+# Unit cube centered at the origin; faces wound for outward normals
+CUBE_VERTS = [
+    (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, 0.5, -0.5), (-0.5, 0.5, -0.5),
+    (-0.5, -0.5, 0.5), (0.5, -0.5, 0.5), (0.5, 0.5, 0.5), (-0.5, 0.5, 0.5),
+]
+CUBE_FACES = [
+    (0, 3, 2, 1),  # bottom
+    (4, 5, 6, 7),  # top
+    (0, 1, 5, 4),  # front (-Y)
+    (2, 3, 7, 6),  # back (+Y)
+    (1, 2, 6, 5),  # right (+X)
+    (3, 0, 4, 7),  # left (-X)
+]
+
+
+def make_box_mesh(name, dimensions, rot_z=0.0):
+    """Build a flat-shaded box mesh datablock centered at the origin.
+
+    An optional Z rotation is baked straight into the vertex
+    coordinates, so no object rotation or transform_apply is needed.
+    """
+    w, d, h = dimensions
+    c, s = math.cos(rot_z), math.sin(rot_z)
+    verts = [(c * x * w - s * y * d, s * x * w + c * y * d, z * h)
+             for (x, y, z) in CUBE_VERTS]
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], CUBE_FACES)
+    # Only derive edges; normals are recomputed downstream anyway
+    mesh.update(calc_edges=True, calc_edges_loose=False)
+    mesh.polygons.foreach_set("use_smooth", np.zeros(len(mesh.polygons), dtype=bool))
+    return mesh
 
 
 def make_box(name, location, dimensions, color_rgba, mat):
-    """Create a box mesh at the given location with given (width, depth, height)."""
-    w, d, h = dimensions
-    bpy.ops.mesh.primitive_cube_add(size=1, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = (w, d, h)
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-    obj.data.materials.append(mat)
-    bake_vertex_colors(obj, color_rgba)
-    bpy.ops.object.shade_flat()
+    """Create a box object at the given location with given (width, depth, height)."""
+    mesh = make_box_mesh(name, dimensions)
+    mesh.materials.append(mat)
+    bake_vertex_colors(mesh, color_rgba)
+
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    bpy.context.collection.objects.link(obj)
     return obj
 
 
+def join_meshes(objects, name):
+    """Concatenate mesh objects into one new mesh datablock.
+
+    Replaces bpy.ops.object.join: bulk-copies vertex, loop, and polygon
+    arrays (plus corner colors and smooth flags) with foreach_get /
+    foreach_set instead of rebuilding bmesh per joined object.
+    """
+    co_parts, vidx_parts, lstart_parts = [], [], []
+    color_parts, smooth_parts = [], []
+    v_off = l_off = p_total = 0
+    for obj in objects:
+        mesh = obj.data
+        nv, nl, npoly = len(mesh.vertices), len(mesh.loops), len(mesh.polygons)
+
+        co = np.empty(nv * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        # Bake the object's world transform into the coordinates
+        mw = np.array(obj.matrix_world, dtype=np.float32)
+        co = co.reshape(-1, 3) @ mw[:3, :3].T + mw[:3, 3]
+        co_parts.append(co.astype(np.float32).ravel())
+
+        vidx = np.empty(nl, dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", vidx)
+        vidx_parts.append(vidx + v_off)
+
+        lstart = np.empty(npoly, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", lstart)
+        lstart_parts.append(lstart + l_off)
+
+        smooth = np.empty(npoly, dtype=bool)
+        mesh.polygons.foreach_get("use_smooth", smooth)
+        smooth_parts.append(smooth)
+
+        colors = np.empty(nl * 4, dtype=np.float32)
+        mesh.color_attributes[0].data.foreach_get("color", colors)
+        color_parts.append(colors)
+
+        v_off += nv
+        l_off += nl
+        p_total += npoly
+
+    merged = bpy.data.meshes.new(name)
+    merged.vertices.add(v_off)
+    merged.loops.add(l_off)
+    merged.polygons.add(p_total)
+    merged.vertices.foreach_set("co", np.concatenate(co_parts))
+    merged.loops.foreach_set("vertex_index", np.concatenate(vidx_parts))
+    # loop_total is derived from consecutive loop_start offsets and has
+    # been read-only since 3.6; setting loop_start alone is sufficient
+    merged.polygons.foreach_set("loop_start", np.concatenate(lstart_parts))
+    merged.polygons.foreach_set("use_smooth", np.concatenate(smooth_parts))
+    attr = merged.color_attributes.new(name="Color", type='FLOAT_COLOR', domain='CORNER')
+    attr.data.foreach_set("color", np.concatenate(color_parts))
+    merged.update(calc_edges=True, calc_edges_loose=False)
+    merged.validate()
+    return merged
+
+
 # ---------------------------------------------------------------------------
 # House construction
 # ---------------------------------------------------------------------------
@@ -142,18 +232,24 @@ def build_roof(mat):
         (5, 1, 2),      # right gable
     ]
 
+    # Enumerating the 9 edges here lets mesh.update skip deriving them
+    # from the face loops
+    edges = [
+        (0, 1), (1, 2), (2, 3), (3, 0),  # wall-top rectangle
+        (4, 5),                          # ridge
+        (0, 4), (3, 4), (1, 5), (2, 5),  # slopes and gables
+    ]
+
     mesh = bpy.data.meshes.new("RoofMesh")
-    mesh.from_pydata(verts, [], faces)
-    mesh.update()
+    mesh.from_pydata(verts, edges, faces)
+    mesh.update(calc_edges=False)
+    mesh.polygons.foreach_set("use_smooth", np.zeros(len(mesh.polygons), dtype=bool))
 
     obj = bpy.data.objects.new("Roof", mesh)
     bpy.context.collection.objects.link(obj)
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
 
     obj.data.materials.append(mat)
-    bake_vertex_colors(obj, ROOF_COLOR)
-    bpy.ops.object.shade_flat()
+    bake_vertex_colors(mesh, ROOF_COLOR)
 
     return obj
 
@@ -170,53 +266,53 @@ def build_door(mat):
     return obj
 
 
-def build_window(name, x_pos, y_face, mat):
-    """Create a window on a wall face."""
-    obj = make_box(
-        name,
-        location=(x_pos, y_face, WINDOW_SILL + WINDOW_HEIGHT / 2),
-        dimensions=(WINDOW_WIDTH, 0.1, WINDOW_HEIGHT),
-        color_rgba=WINDOW_COLOR,
-        mat=mat,
-    )
-    return obj
+def build_windows(mat):
+    """Create the two side-wall windows, sharing a single mesh datablock."""
+    # Both windows sit on side walls, so the 90-degree turn is baked
+    # into the shared mesh rather than applied per object
+    mesh = make_box_mesh("Window", (WINDOW_WIDTH, 0.1, WINDOW_HEIGHT),
+                         rot_z=math.radians(90))
+    mesh.materials.append(mat)
+    bake_vertex_colors(mesh, WINDOW_COLOR)
+
+    windows = []
+    for name, x_pos in (
+        ("WindowLeft", -HOUSE_WIDTH / 2 - WINDOW_INSET),
+        ("WindowRight", HOUSE_WIDTH / 2 + WINDOW_INSET),
+    ):
+        obj = bpy.data.objects.new(name, mesh)
+        obj.location = (x_pos, 0, WINDOW_SILL + WINDOW_HEIGHT / 2)
+        bpy.context.collection.objects.link(obj)
+        windows.append(obj)
+    return windows
 
 
 def build_house():
     """Assemble all house parts."""
-    wall_mat = make_material("Wall", WALL_COLOR)
-    roof_mat = make_material("Roof", ROOF_COLOR)
-    door_mat = make_material("Door", DOOR_COLOR)
-    window_mat = make_material("Window", WINDOW_COLOR)
+    # One shared vertex-color material is enough: per-part colors live in
+    # the baked color attribute, not the material.
+    house_mat = make_material("House", (1.0, 1.0, 1.0, 1.0))
 
     parts = []
 
     # Walls
-    walls = build_walls(wall_mat)
+    walls = build_walls(house_mat)
     parts.append(walls)
 
     # Roof
-    roof = build_roof(roof_mat)
+    roof = build_roof(house_mat)
     parts.append(roof)
 
     # Door on front face
-    door = build_door(door_mat)
+    door = build_door(house_mat)
     parts.append(door)
 
-    # Windows — one on each side wall
-    side_y = HOUSE_DEPTH / 2 + WINDOW_INSET
-    w_left = build_window("WindowLeft", -HOUSE_WIDTH / 2 - WINDOW_INSET, 0, window_mat)
-    w_left.rotation_euler.z = math.radians(90)
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
-    # Reposition after rotation
-    w_left.location = (-HOUSE_WIDTH / 2 - WINDOW_INSET, 0, WINDOW_SILL + WINDOW_HEIGHT / 2)
-    parts.append(w_left)
-
-    w_right = build_window("WindowRight", HOUSE_WIDTH / 2 + WINDOW_INSET, 0, window_mat)
-    w_right.rotation_euler.z = math.radians(90)
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
-    w_right.location = (HOUSE_WIDTH / 2 + WINDOW_INSET, 0, WINDOW_SILL + WINDOW_HEIGHT / 2)
-    parts.append(w_right)
+    # Windows — one on each side wall, instancing the same mesh
+    parts.extend(build_windows(house_mat))
+
+    # Flush the depsgraph once for everything linked above, instead of
+    # paying an implicit update per builder
+    bpy.context.view_layer.update()
 
     return parts
 
@@ -225,17 +321,18 @@ def build_house():
 # Render setup
 # ---------------------------------------------------------------------------
 
-def add_ground():
+def add_ground(manifest):
     bpy.ops.mesh.primitive_plane_add(size=30, location=(0, 0, 0))
     ground = bpy.context.active_object
     ground.name = "Ground"
     ground.data.materials.append(
         make_material("Ground", (0.30, 0.38, 0.20, 1.0), roughness=0.95)
     )
+    manifest['scenery'].append(ground)
     return ground
 
 
-def setup_lighting():
+def setup_lighting(manifest):
     # Sun
     sun = bpy.data.lights.new("Sun", type='SUN')
     sun.energy = 3.0
@@ -243,6 +340,7 @@ def setup_lighting():
     sun_obj = bpy.data.objects.new("Sun", sun)
     sun_obj.rotation_euler = (math.radians(45), math.radians(15), math.radians(30))
     bpy.context.collection.objects.link(sun_obj)
+    manifest['light'].append(sun_obj)
 
     # Fill light
     fill = bpy.data.lights.new("Fill", type='AREA')
@@ -252,10 +350,12 @@ def setup_lighting():
     fill_obj = bpy.data.objects.new("Fill", fill)
     fill_obj.location = (-8, -6, 4)
     bpy.context.collection.objects.link(fill_obj)
+    manifest['light'].append(fill_obj)
 
     target = bpy.data.objects.new("FillTarget", None)
     target.location = (0, 0, WALL_HEIGHT * 0.5)
     bpy.context.collection.objects.link(target)
+    manifest['empty'].append(target)
     c = fill_obj.constraints.new(type='TRACK_TO')
     c.target = target
     c.track_axis = 'TRACK_NEGATIVE_Z'
@@ -271,17 +371,19 @@ def setup_lighting():
     bpy.context.scene.world = world
 
 
-def make_camera(location, name="Camera"):
+def make_camera(location, name, manifest):
     total_h = WALL_HEIGHT + ROOF_PEAK
     cam = bpy.data.cameras.new(name)
     cam.lens = 50
     obj = bpy.data.objects.new(name, cam)
     obj.location = location
     bpy.context.collection.objects.link(obj)
+    manifest['camera'].append(obj)
 
     target = bpy.data.objects.new(f"{name}Target", None)
     target.location = (0, 0, total_h * 0.45)
     bpy.context.collection.objects.link(target)
+    manifest['empty'].append(target)
     c = obj.constraints.new(type='TRACK_TO')
     c.target = target
     c.track_axis = 'TRACK_NEGATIVE_Z'
@@ -290,59 +392,120 @@ def make_camera(location, name="Camera"):
     return obj
 
 
-def render_to(camera_obj, filepath):
+def enable_cycles_gpu(scene):
+    """Pick the fastest available Cycles backend, falling back to CPU."""
+    prefs = bpy.context.preferences.addons['cycles'].preferences
+    backend = 'NONE'
+    for candidate in ('OPTIX', 'CUDA', 'HIP', 'METAL', 'ONEAPI'):
+        try:
+            prefs.compute_device_type = candidate
+        except TypeError:
+            # Backend not compiled into this Blender build
+            continue
+        prefs.get_devices()
+        for d in prefs.devices:
+            d.use = d.type != 'CPU'
+        if any(d.use for d in prefs.devices):
+            backend = candidate
+            break
+    scene.cycles.device = 'GPU' if backend != 'NONE' else 'CPU'
+
+
+def render_views(cameras, filepaths, quick=True):
+    """Render one frame per camera in a single render invocation.
+
+    Quick mode rasterizes with Workbench; --final uses the full Cycles
+    path. Driving all views through one animation render amortizes BVH
+    build, geometry upload, and shader warm-up instead of paying them
+    once per bpy.ops.render.render call.
+    """
     scene = bpy.context.scene
-    scene.camera = camera_obj
-    scene.render.engine = 'CYCLES'
-    scene.cycles.device = 'CPU'
-    scene.cycles.samples = RENDER_SAMPLES
+    if quick:
+        scene.render.engine = 'BLENDER_WORKBENCH'
+        scene.display.shading.light = 'FLAT'
+        scene.display.shading.color_type = 'VERTEX'
+    else:
+        scene.render.engine = 'CYCLES'
+        enable_cycles_gpu(scene)
+        scene.cycles.samples = RENDER_SAMPLES
+        scene.cycles.use_denoising = True
+        scene.cycles.denoiser = 'OPENIMAGEDENOISE'
+        scene.cycles.denoising_input_passes = 'RGB_ALBEDO_NORMAL'
+        scene.cycles.denoising_prefilter = 'ACCURATE'
+        # Let converged pixels stop sampling early
+        scene.cycles.use_adaptive_sampling = True
+        scene.cycles.adaptive_threshold = 0.01
+        # Faster BVH build; persistent data below makes rebuilds rare
+        scene.cycles.debug_use_spatial_splits = False
+
+    # Keep BVH, compiled shaders, and uploaded geometry alive between
+    # the frames of the view render instead of rebuilding per frame
+    scene.render.use_persistent_data = True
     scene.render.resolution_x = RENDER_RES
     scene.render.resolution_y = RENDER_RES
     scene.render.image_settings.file_format = 'PNG'
-    scene.render.filepath = filepath
-    bpy.ops.render.render(write_still=True)
-    print(f"  Rendered: {filepath}")
+
+    scene.frame_start = 1
+    scene.frame_end = len(cameras)
+    scene.camera = cameras[0]
+
+    def _swap_camera(scene_, _depsgraph=None):
+        scene_.camera = cameras[scene_.frame_current - 1]
+
+    bpy.app.handlers.frame_change_pre.append(_swap_camera)
+    scene.render.filepath = os.path.join(RENDER_DIR, "view_####.png")
+    try:
+        bpy.ops.render.render(animation=True)
+    finally:
+        bpy.app.handlers.frame_change_pre.remove(_swap_camera)
+
+    for frame, filepath in enumerate(filepaths, start=1):
+        os.replace(os.path.join(RENDER_DIR, f"view_{frame:04d}.png"), filepath)
+        print(f"  Rendered: {filepath}")
 
 
 # ---------------------------------------------------------------------------
 # Export
 # ---------------------------------------------------------------------------
 
-def export_glb(render_objects):
-    """Remove render-only objects, join house meshes, then export as GLB."""
-    for obj in render_objects:
+def export_glb(manifest):
+    """Remove render-only objects, merge house meshes, then export as GLB."""
+    # Tear down exactly what the builders recorded — no bpy.data scans
+    for obj in (manifest['scenery'] + manifest['light']
+                + manifest['camera'] + manifest['empty']):
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+    # Merge the model meshes into a single datablock (no join operator)
+    sources = manifest['mesh']
+    mesh = join_meshes(sources, "House")
+
+    # All parts share one vertex-color material already
+    mesh.materials.append(sources[0].data.materials[0])
+
+    # The merged mesh is in world coordinates and the new object sits at
+    # the world origin, so no cursor/origin_set pass is needed.
+    house = bpy.data.objects.new("House", mesh)
+    bpy.context.collection.objects.link(house)
+    for obj in sources:
         bpy.data.objects.remove(obj, do_unlink=True)
-    for obj in list(bpy.data.objects):
-        if obj.type in ('CAMERA', 'LIGHT', 'EMPTY'):
-            bpy.data.objects.remove(obj, do_unlink=True)
-
-    # Join all remaining meshes into a single object
-    bpy.ops.object.select_all(action='DESELECT')
-    meshes = [o for o in bpy.data.objects if o.type == 'MESH']
-    for m in meshes:
-        m.select_set(True)
-    bpy.context.view_layer.objects.active = meshes[0]
-    bpy.ops.object.parent_clear(type='CLEAR_KEEP_TRANSFORM')
-    bpy.ops.object.join()
-    house = bpy.context.active_object
-    house.name = "House"
-
-    # Collapse to a single material (game uses vertex colors)
-    while len(house.data.materials) > 1:
-        house.data.materials.pop(index=1)
-    house.data.materials[0].name = "House"
-
-    # Origin at ground level
-    bpy.context.scene.cursor.location = (0, 0, 0)
-    bpy.ops.object.origin_set(type='ORIGIN_CURSOR')
 
     os.makedirs(os.path.dirname(EXPORT_FILE), exist_ok=True)
+    # The model carries only vertex colors — skip the exporter's image,
+    # UV, and animation code paths entirely
     bpy.ops.export_scene.gltf(
         filepath=EXPORT_FILE,
         export_format='GLB',
+        export_image_format='NONE',
         export_normals=True,
         export_materials='EXPORT',
-        export_texcoords=True,
+        export_texcoords=False,
+        export_tangents=False,
+        export_animations=False,
+        export_skins=False,
+        export_morph=False,
+        export_cameras=False,
+        export_lights=False,
+        export_extras=False,
         export_yup=True,
         export_apply=True,
         use_selection=False,
@@ -356,28 +519,36 @@ def export_glb(render_objects):
 
 def main():
     do_export = "--export" in sys.argv
+    quick = "--final" not in sys.argv
 
     # Clean scene
     bpy.ops.wm.read_factory_settings(use_empty=True)
 
+    # Manifest of everything we create, by role, so teardown at export
+    # time never has to scan bpy.data.objects
+    manifest = {'mesh': [], 'scenery': [], 'light': [], 'camera': [], 'empty': []}
+
     # Build house
-    parts = build_house()
+    manifest['mesh'] = build_house()
 
     # Render setup
-    ground = add_ground()
-    setup_lighting()
+    add_ground(manifest)
+    setup_lighting(manifest)
 
     os.makedirs(RENDER_DIR, exist_ok=True)
 
-    cam_front = make_camera((8, -7, 5), "CamFront")
-    render_to(cam_front, os.path.join(RENDER_DIR, "house_front.png"))
-
-    cam_side = make_camera((-3, -10, 4), "CamSide")
-    render_to(cam_side, os.path.join(RENDER_DIR, "house_side.png"))
+    cam_front = make_camera((8, -7, 5), "CamFront", manifest)
+    cam_side = make_camera((-3, -10, 4), "CamSide", manifest)
+    render_views(
+        [cam_front, cam_side],
+        [os.path.join(RENDER_DIR, "house_front.png"),
+         os.path.join(RENDER_DIR, "house_side.png")],
+        quick=quick,
+    )
 
     # Export if requested
     if do_export:
-        export_glb([ground])
+        export_glb(manifest)
 
     # Summary
     total_h = WALL_HEIGHT + ROOF_PEAK
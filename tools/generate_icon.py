@@ -5,9 +5,12 @@ matching the procedural terrain renderer aesthetic.
 """
 
 from PIL import Image, ImageDraw
-import math
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
 
+import numpy as np
+
 SIZE = 1024
 MARGIN = 80  # breathing room from edges
 CORNER_RADIUS = 180  # macOS-style rounded square
@@ -27,8 +30,7 @@ def draw_rounded_rect_mask(size, radius):
 
 
 def draw_background(img):
-    """Draw a gradient sky-to-terrain background."""
-    draw = ImageDraw.Draw(img)
+    """Draw a gradient sky-to-terrain background with rolling hills."""
     sky_top = (60, 130, 190)
     sky_bottom = (140, 190, 220)
     ground_top = (75, 130, 60)
@@ -36,52 +38,85 @@ def draw_background(img):
 
     horizon = int(SIZE * 0.65)
 
-    for y in range(SIZE):
-        if y < horizon:
-            t = y / horizon
-            color = lerp_color(sky_top, sky_bottom, t)
-        else:
-            t = (y - horizon) / (SIZE - horizon)
-            color = lerp_color(ground_top, ground_bottom, t)
-        draw.line([(0, y), (SIZE, y)], fill=color)
+    # Per-row colors computed in one vectorized pass, then broadcast
+    # across the width — no per-scanline Python loop or line draws
+    sky_t = np.linspace(0, 1, horizon, dtype=np.float32)[:, None]
+    sky = (1 - sky_t) * np.array(sky_top, dtype=np.float32) \
+        + sky_t * np.array(sky_bottom, dtype=np.float32)
+    grd_t = np.linspace(0, 1, SIZE - horizon, dtype=np.float32)[:, None]
+    grd = (1 - grd_t) * np.array(ground_top, dtype=np.float32) \
+        + grd_t * np.array(ground_bottom, dtype=np.float32)
+    rows = np.concatenate([sky, grd], axis=0)  # (SIZE, 3)
+
+    # .astype copies, so the broadcast array becomes writable and the
+    # hills below can be filled into the same pixel buffer before the
+    # single paste into the PIL image
+    arr = np.broadcast_to(rows[:, None, :], (SIZE, SIZE, 3)).astype(np.uint8)
+    draw_terrain_bumps(arr, horizon)
+    img.paste(Image.fromarray(arr, "RGB"))
+
+
+def _hill_heights(base_y, waves):
+    """Per-column ridge height: a coarse sum-of-sines upsampled to pixels."""
+    x = np.arange(0, SIZE + 1, 8, dtype=np.float32)
+    y = base_y + sum(np.sin(x * freq + phase) * amp for freq, amp, phase in waves)
+    return np.interp(np.arange(SIZE), x, y)
+
 
+def draw_terrain_bumps(arr, horizon_y):
+    """Fill subtle rolling hills at the horizon into the pixel array.
 
-def draw_terrain_bumps(draw, horizon_y):
-    """Draw subtle rolling hills at the horizon."""
-    hill_color_back = (85, 140, 70)
-    hill_color_front = (65, 120, 50)
+    Each ridge is monotone in x, so instead of a polygon scan-convert we
+    compute a height per column and fill everything below it with one
+    boolean-mask assignment.
+    """
+    rows = np.arange(SIZE)[:, None]
 
     # Back hills
-    points = [(0, horizon_y + 40)]
-    for x in range(0, SIZE + 1, 8):
-        y_offset = math.sin(x * 0.008) * 30 + math.sin(x * 0.02) * 12
-        points.append((x, horizon_y + 20 + y_offset))
-    points.append((SIZE, SIZE))
-    points.append((0, SIZE))
-    draw.polygon(points, fill=hill_color_back)
+    heights = _hill_heights(horizon_y + 20, [(0.008, 30, 0.0), (0.02, 12, 0.0)])
+    arr[rows >= heights[None, :]] = (85, 140, 70)
 
     # Front hills
-    points = [(0, horizon_y + 60)]
-    for x in range(0, SIZE + 1, 8):
-        y_offset = math.sin(x * 0.012 + 1.5) * 25 + math.sin(x * 0.025 + 0.7) * 15
-        points.append((x, horizon_y + 50 + y_offset))
-    points.append((SIZE, SIZE))
-    points.append((0, SIZE))
-    draw.polygon(points, fill=hill_color_front)
+    heights = _hill_heights(horizon_y + 50, [(0.012, 25, 1.5), (0.025, 15, 0.7)])
+    arr[rows >= heights[None, :]] = (65, 120, 50)
+
+
+def _sprite_canvas(max_width, trunk_h, layer_y0, layer_heights, overlap):
+    """Size a transparent canvas for a tree sprite.
+
+    Walks the canopy layer metrics to find how far above the base the
+    topmost apex reaches. Returns (image, draw, cx, base_y) with the
+    tree base on the canvas' bottom pixel row.
+    """
+    top = -trunk_h
+    layer_y = layer_y0
+    for h in layer_heights:
+        top = min(top, layer_y - h)
+        layer_y -= h - overlap
+    width = max_width + 2
+    height = -top + 1
+    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    return img, ImageDraw.Draw(img), width // 2, height - 1
+
 
+def paste_sprite(img, sprite, cx, base_y):
+    """Composite a sprite so its bottom-center lands at (cx, base_y)."""
+    img.alpha_composite(
+        sprite, dest=(cx - sprite.width // 2, base_y - sprite.height + 1))
 
-def draw_tree(draw, cx, base_y, scale=1.0):
-    """Draw a stylized conifer tree (layered triangles + trunk)."""
+
+@functools.lru_cache(maxsize=None)
+def tree_sprite(scale=1.0):
+    """Render a stylized conifer tree (layered triangles + trunk).
+
+    Rendered once per scale to a transparent sub-image and cached, so
+    repeated placements are a single alpha_composite instead of a fresh
+    round of polygon fills.
+    """
     trunk_w = int(22 * scale)
     trunk_h = int(80 * scale)
     trunk_color = (90, 65, 40)
 
-    # Trunk
-    draw.rectangle(
-        [cx - trunk_w // 2, base_y - trunk_h, cx + trunk_w // 2, base_y],
-        fill=trunk_color,
-    )
-
     # Canopy layers (bottom to top, wider to narrower)
     layers = [
         {"width": 220, "height": 140, "color": (40, 110, 45)},
@@ -90,8 +125,19 @@ def draw_tree(draw, cx, base_y, scale=1.0):
         {"width": 95, "height": 105, "color": (65, 160, 70)},
     ]
 
-    layer_y = base_y - trunk_h + int(20 * scale)
+    layer_y0 = -trunk_h + int(20 * scale)
     overlap = int(55 * scale)
+    img, draw, cx, base_y = _sprite_canvas(
+        int(220 * scale), trunk_h, layer_y0,
+        [int(l["height"] * scale) for l in layers], overlap)
+
+    # Trunk
+    draw.rectangle(
+        [cx - trunk_w // 2, base_y - trunk_h, cx + trunk_w // 2, base_y],
+        fill=trunk_color,
+    )
+
+    layer_y = base_y + layer_y0
 
     for layer in layers:
         w = int(layer["width"] * scale)
@@ -115,18 +161,16 @@ def draw_tree(draw, cx, base_y, scale=1.0):
 
         layer_y -= h - overlap
 
+    return img
+
 
-def draw_small_tree(draw, cx, base_y, scale=0.35):
-    """Draw a small background tree."""
+@functools.lru_cache(maxsize=None)
+def small_tree_sprite(scale=0.35):
+    """Render a small background tree, cached per scale like tree_sprite."""
     trunk_w = int(12 * scale * 2)
     trunk_h = int(50 * scale * 2)
     trunk_color = (70, 55, 35)
 
-    draw.rectangle(
-        [cx - trunk_w // 2, base_y - trunk_h, cx + trunk_w // 2, base_y],
-        fill=trunk_color,
-    )
-
     layers = [
         {"width": 160, "height": 100, "color": (35, 95, 38)},
         {"width": 120, "height": 90, "color": (42, 110, 48)},
@@ -134,8 +178,18 @@ def draw_small_tree(draw, cx, base_y, scale=0.35):
     ]
 
     s = scale * 2
-    layer_y = base_y - trunk_h + int(15 * s)
+    layer_y0 = -trunk_h + int(15 * s)
     overlap = int(40 * s)
+    img, draw, cx, base_y = _sprite_canvas(
+        int(160 * s), trunk_h, layer_y0,
+        [int(l["height"] * s) for l in layers], overlap)
+
+    draw.rectangle(
+        [cx - trunk_w // 2, base_y - trunk_h, cx + trunk_w // 2, base_y],
+        fill=trunk_color,
+    )
+
+    layer_y = base_y + layer_y0
 
     for layer in layers:
         w = int(layer["width"] * s)
@@ -148,28 +202,28 @@ def draw_small_tree(draw, cx, base_y, scale=0.35):
         draw.polygon(triangle, fill=layer["color"])
         layer_y -= h - overlap
 
+    return img
+
 
 def main():
     img = Image.new("RGBA", (SIZE, SIZE), (0, 0, 0, 0))
 
-    # Draw background
+    # Draw background (gradient + hills, composed in one ndarray)
     draw_background(img)
-    draw = ImageDraw.Draw(img)
 
     horizon_y = int(SIZE * 0.65)
-    draw_terrain_bumps(draw, horizon_y)
 
     # Small background trees
-    draw_small_tree(draw, 180, horizon_y + 25, scale=0.30)
-    draw_small_tree(draw, 750, horizon_y + 15, scale=0.25)
-    draw_small_tree(draw, 870, horizon_y + 30, scale=0.32)
+    paste_sprite(img, small_tree_sprite(scale=0.30), 180, horizon_y + 25)
+    paste_sprite(img, small_tree_sprite(scale=0.25), 750, horizon_y + 15)
+    paste_sprite(img, small_tree_sprite(scale=0.32), 870, horizon_y + 30)
 
     # Main tree (center, prominent)
-    draw_tree(draw, SIZE // 2, horizon_y + 40, scale=1.15)
+    paste_sprite(img, tree_sprite(scale=1.15), SIZE // 2, horizon_y + 40)
 
-    # Apply rounded rectangle mask (macOS style)
-    mask = draw_rounded_rect_mask(SIZE, CORNER_RADIUS)
-    img.putalpha(mask)
+    # Apply rounded rectangle mask (macOS style) to the master only;
+    # each iconset size gets a fresh mask drawn at its own resolution
+    img.putalpha(draw_rounded_rect_mask(SIZE, CORNER_RADIUS))
 
     # Save the 1024x1024 master icon
     out_dir = os.path.join(os.path.dirname(__file__), "..", "assets", "icon")
@@ -196,9 +250,37 @@ def main():
         ("icon_512x512@2x.png", 1024),
     ]
 
-    for name, size in sizes:
-        resized = img.resize((size, size), Image.LANCZOS)
-        resized.save(os.path.join(iconset_dir, name), "PNG")
+    # Downsample only the RGB content through a mip chain: each level
+    # halves the previous one, so a 16px icon never convolves a Lanczos
+    # footprint over the full 1024px master. The alpha channel is not
+    # resampled at all — a rounded-rect mask is drawn per size instead,
+    # which is cheaper and gives crisper corners.
+    mips = {SIZE: img.convert("RGB")}
+    s = SIZE
+    while s > 16:
+        s //= 2
+        mips[s] = mips[s * 2].resize((s, s), Image.LANCZOS)
+
+    # The iconset is an intermediate fed to iconutil, so trade ~15%
+    # file size for a much cheaper zlib encode (compress_level=1), and
+    # run the saves on a small thread pool — libpng releases the GIL
+    # while compressing. Only the master icon keeps default compression.
+    masks = {}
+    futures = []
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for name, size in sizes:
+            src = mips[min(k for k in mips if k >= size)]
+            resized = src if src.size[0] == size else src.resize((size, size), Image.LANCZOS)
+            if size not in masks:
+                masks[size] = draw_rounded_rect_mask(
+                    size, max(1, int(CORNER_RADIUS * size / SIZE)))
+            out = resized.convert("RGBA")
+            out.putalpha(masks[size])
+            futures.append(pool.submit(
+                out.save, os.path.join(iconset_dir, name), "PNG",
+                compress_level=1, optimize=False))
+    for future in futures:
+        future.result()
 
     print(f"Generated iconset: {iconset_dir}")
     return iconset_dir